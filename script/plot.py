@@ -1,8 +1,9 @@
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap, Normalize
 import numpy as np
 import seaborn as sns
-from collections import Counter
 import re
 
 # Set modern style
@@ -16,6 +17,9 @@ PROPERTIES = [
     'Task', 'Domain',  'Size', 'Languages'
 ]
 
+# Columns read from the dataset file, the remaining ones are skipped when parsing
+USED_COLUMNS = set(PROPERTIES) | {'Year'}
+
 # SPDX license mapping for cleaner display
 SPDX_MAPPING = {
     'Creative Commons Attribution Share Alike 4.0 International': 'CC-BY-SA-4.0',
@@ -27,6 +31,14 @@ SPDX_MAPPING = {
     'None': 'None'
 }
 
+# Substring matching of SPDX_MAPPING as a single regex: each entry is its own
+# alternative, tried in mapping order, so the first entry found in a value wins
+_SPDX_PATTERN = re.compile(
+    '^(?:' + '|'.join(f'.*?({re.escape(full_name)})' for full_name in SPDX_MAPPING) + ')',
+    re.DOTALL
+)
+_SPDX_CODES = list(SPDX_MAPPING.values())
+
 # Color scheme - using a more diverse palette for better distinction
 COLORS = {
     'undefined': '#808080',  # Grey for undefined/empty values
@@ -36,6 +48,9 @@ COLORS = {
                 '#aec7e8', '#ffbb78', '#98df8a', '#ff9896', '#c5b0d5']
 }
 
+# Heatmap colormap shared by the plots: 'Blues' starting from light blue (0.2) instead of white (0.0)
+_BLUES = ListedColormap(matplotlib.colormaps['Blues'](np.linspace(0.2, 1.0, 256)))
+
 # Add language mapping after the SPDX_MAPPING
 LANGUAGE_MAPPING = {
     'en': 'English',
@@ -53,6 +68,11 @@ LANGUAGE_MAPPING = {
     'multiple': 'Multiple'
 }
 
+def fill_undefined(values):
+    """Replace missing, empty and dash values of a Series with 'Undefined' in one pass"""
+    values = values.astype('string')
+    return values.mask(values.isna() | values.isin(['', '-', 'nan']), 'Undefined')
+
 def capitalize_label(label):
     """Capitalize only the first letter if it's lowercase, preserve the rest"""
     if not label or label in ['Undefined', 'Others']:
@@ -64,6 +84,12 @@ def capitalize_label(label):
     else:
         return label  # First letter is already uppercase, return as-is
 
+def capitalize_series(values):
+    """Capitalize the first letter of each label in a Series (vectorized capitalize_label)"""
+    first = values.str[:1]
+    lowercase = first.str.islower() & ~values.isin(['Undefined', 'Others'])
+    return values.mask(lowercase, first.str.upper() + values.str[1:])
+
 def map_language_codes(language_value):
     """Convert ISO language codes to full language names"""
     if pd.isna(language_value) or language_value == '' or language_value == '-':
@@ -93,6 +119,27 @@ def map_language_codes(language_value):
     # If no exact match found, return 'Undefined'
     return 'Undefined'
 
+def map_language_series(values):
+    """Convert a Series of ISO language codes to full names (vectorized map_language_codes)"""
+    codes = values.astype(str).str.lower().str.strip()
+
+    # Check for exact matches only
+    result = codes.map(LANGUAGE_MAPPING)
+
+    # Map each code of comma-separated lists, capitalizing unknown ones
+    multiple = result.isna() & codes.str.contains(',', regex=False, na=False)
+    if multiple.any():
+        languages = codes[multiple].str.split(',').explode().str.strip()
+        languages = languages.map(LANGUAGE_MAPPING).fillna(languages.str.capitalize())
+        result[multiple] = languages.groupby(level=0, sort=False).agg(', '.join)
+
+    # Missing values and unknown codes become 'Undefined'
+    return result.fillna('Undefined')
+
+# Size categories, split at the given boundaries, plus 'Undefined' for unparseable sizes
+SIZE_BOUNDARIES = np.array([1e3, 1e4, 1e5])
+SIZE_LABELS = np.array(['<1K', '1K-10K', '10K-100K', '>100K', 'Undefined'], dtype=object)
+
 # Add size mapping function
 def map_size_categories(size_value):
     """Convert size values to categorical ranges"""
@@ -126,10 +173,40 @@ def map_size_categories(size_value):
         # If conversion fails, return 'Undefined'
         return 'Undefined'
 
+def map_size_series(values):
+    """Convert a Series of size values to categorical ranges (vectorized map_size_categories)"""
+    sizes = values.astype(str).str.strip().str.lower().str.replace(',', '', regex=False)
+
+    # Remove common suffixes and remember the multiplier they stand for
+    thousands = sizes.str.contains('k', regex=False, na=False)
+    millions = ~thousands & sizes.str.contains('m', regex=False, na=False)
+    sizes = sizes.mask(thousands, sizes.str.replace('k', '', regex=False))
+    sizes = sizes.mask(millions, sizes.str.replace('m', '', regex=False))
+    scale = np.where(thousands, 1e3, np.where(millions, 1e6, 1.0))
+
+    # Values that cannot be converted become NaN, hence 'Undefined'
+    size_num = pd.to_numeric(sizes, errors='coerce') * scale
+
+    # Categorize based on size
+    codes = bucket_sizes(size_num.to_numpy(dtype=np.float64, na_value=np.nan))
+    return pd.Series(SIZE_LABELS[codes], index=values.index)
+
+def bucket_sizes(size_num):
+    """Return the SIZE_LABELS index of each size in a float array"""
+    # Sizes equal to a boundary belong to the upper category, like in map_size_categories
+    codes = np.searchsorted(SIZE_BOUNDARIES, size_num, side='right').astype(np.int8)
+    codes[np.isnan(size_num)] = len(SIZE_LABELS) - 1
+    return codes
+
 def load_and_clean_data(filepath):
     """Load and clean the dataset"""
-    df = pd.read_csv(filepath)
+    # Every value ends up as a label, so skip per-column type inference
+    df = pd.read_csv(filepath, usecols=lambda column: column.strip() in USED_COLUMNS, dtype=str)
     df.columns = df.columns.str.strip()
+    
+    # Properties have few distinct values, store them as categories
+    properties = [prop for prop in PROPERTIES if prop in df.columns]
+    df[properties] = df[properties].astype('category')
     return df
 
 def map_license_to_spdx(license_value):
@@ -137,150 +214,174 @@ def map_license_to_spdx(license_value):
     if pd.isna(license_value) or license_value == '' or license_value == '-':
         return 'None'
     
-    for full_name, spdx in SPDX_MAPPING.items():
-        if full_name in str(license_value):
-            return spdx
+    match = _SPDX_PATTERN.search(str(license_value))
+    if match:
+        return _SPDX_CODES[match.lastindex - 1]
     
     if len(str(license_value)) > 20:
         return str(license_value)[:17] + '...'
     
     return str(license_value)
 
+def map_license_series(values):
+    """Convert a Series of license names to SPDX codes (vectorized map_license_to_spdx)"""
+    missing = values.isna() | values.isin(['', '-'])
+
+    # Exact matches are a plain hash lookup
+    result = values.map(SPDX_MAPPING)
+
+    # Substring matches take one regex pass; the non-empty group names the entry
+    unmatched = result.isna()
+    if unmatched.any():
+        found = values[unmatched].str.extract(_SPDX_PATTERN).bfill(axis=1).iloc[:, 0]
+        result[unmatched] = found.map(SPDX_MAPPING)
+
+    # Unknown licenses are kept as-is, truncated when too long
+    fallback = values.where(values.str.len() <= 20, values.str.slice(0, 17) + '...')
+    result = result.fillna(fallback)
+    result[missing] = 'None'
+
+    return result
+
+# Properties whose raw values need mapping before counting
+PROPERTY_MAPPERS = {
+    'License': map_license_series,
+    'Languages': map_language_series,
+    'Size': map_size_series
+}
+
+def map_categories(values, mapper):
+    """Apply a Series mapper once per distinct value instead of once per row"""
+    values = values.astype('category')
+    
+    # Missing values are mapped as 'Undefined', appended after the categories
+    categories = pd.Series(list(values.cat.categories.astype(str)) + ['Undefined'])
+    mapped = mapper(categories).to_numpy(dtype=object)
+    
+    # Missing values have code -1, which picks the trailing 'Undefined' entry
+    return pd.Series(mapped[values.cat.codes.to_numpy()], index=values.index)
+
 def aggregate_low_frequency_values(values, threshold=1):
     """Aggregate values with frequency below threshold into 'Others'"""
-    counter = Counter(values)
-    high_freq = {k: v for k, v in counter.items() if v >= threshold}
-    low_freq = {k: v for k, v in counter.items() if v < threshold}
+    # Counts in order of first appearance, like a Counter would give
+    counts = values.value_counts(sort=False, dropna=False)
     
-    result = high_freq.copy()
-    if sum(low_freq.values()) > 0:
-        result['Others'] = sum(low_freq.values())
+    # Every counted value occurs at least once, nothing to aggregate
+    if threshold <= 1:
+        return counts
+    
+    result = counts[counts >= threshold].copy()
+    
+    low_freq_total = counts[counts < threshold].sum()
+    if low_freq_total > 0:
+        result['Others'] = low_freq_total
     
     return result
 
-def create_stacked_distribution_plot(df, properties, output_file='dataset_distribution_stacked.png'):
-    """Create a single stacked horizontal bar chart"""
+def normalize_counts(counts):
+    """Normalize an array of counts to [0,1] for the colormap, 0.5 if they are all equal"""
+    norm = Normalize(vmin=counts.min(), vmax=counts.max())
+    if norm.vmin == norm.vmax:
+        return np.full(len(counts), 0.5)
+    return np.asarray(norm(counts))
+
+def contrast_text_colors(rgba):
+    """Pick black or white text for each RGBA background color based on its brightness"""
+    # Relative luminance (brightness) of every color in one product
+    brightness = np.asarray(rgba)[:, :3] @ np.array([0.299, 0.587, 0.114])
     
-    # Set up the figure with reduced height
-    fig, ax = plt.subplots(figsize=(12, 6))
+    # Use black text for light backgrounds, white for dark backgrounds
+    return np.where(brightness > 0.5, 'black', 'white')
+
+def clean_labels(values, mapper=None):
+    """Turn a Series of raw property values into display labels"""
+    # Special handling for License, Languages and Size columns
+    if mapper is not None:
+        values = mapper(values)
     
-    # Prepare data for each property
-    property_data = {}
+    # Replace missing values, empty strings and dashes with 'Undefined'
+    values = fill_undefined(values)
     
-    for prop in properties:
-        values = df[prop].fillna('Undefined').astype(str)
-        
-        # Special handling for License column
-        if prop == 'License':
-            values = values.apply(map_license_to_spdx)
-        # Special handling for Languages column
-        elif prop == 'Languages':
-            values = values.apply(map_language_codes)
-        # Special handling for Size column
-        elif prop == 'Size':
-            values = values.apply(map_size_categories)
-        
-        # Replace empty strings and dashes with 'Undefined'
-        values = values.replace(['', '-', 'nan'], 'Undefined')
-        
-        # Capitalize all labels
-        values = values.apply(capitalize_label)
-        
-        # Aggregate low frequency values
-        value_counts = aggregate_low_frequency_values(values, threshold=1)
-        
-        # Sort by frequency (descending), but put 'Undefined' last
-        sorted_items = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
-        # Move 'Undefined' to the end if it exists
-        undefined_item = None
-        other_items = []
-        for item in sorted_items:
-            if item[0] == 'Undefined':
-                undefined_item = item
-            else:
-                other_items.append(item)
-        
-        property_data[prop] = dict(sorted_items)
-    
-    # Create color mapping based on frequency (heatmap style)
-    all_counts = []
-    for prop_data in property_data.values():
-        all_counts.extend(prop_data.values())
+    # Capitalize all labels
+    return capitalize_series(values)
+
+def count_property_values(df, prop):
+    """Clean, map and count the values of a property, sorted by frequency with 'Undefined' last"""
+    # All string work runs once per distinct value, then is spread back to the rows
+    mapper = PROPERTY_MAPPERS.get(prop)
+    values = map_categories(df[prop], lambda categories: clean_labels(categories, mapper))
+    
+    # Aggregate low frequency values
+    value_counts = aggregate_low_frequency_values(values, threshold=1)
+    
+    # Sort by frequency (descending), but put 'Undefined' last; ties keep their order
+    undefined = value_counts.index == 'Undefined'
+    sorted_counts = value_counts[~undefined].sort_values(ascending=False, kind='stable')
+    return pd.concat([sorted_counts, value_counts[undefined]]).to_dict()
+
+def compute_property_data(df, properties):
+    """Count the values of each property, ready to be plotted"""
+    return {prop: count_property_values(df, prop) for prop in properties}
+
+def create_stacked_distribution_plot(df, properties, output_file='dataset_distribution_stacked.png', 
+                                     property_data=None, dpi=300):
+    """Create a single stacked horizontal bar chart"""
     
-    min_count = min(all_counts)
-    max_count = max(all_counts)
+    # Set up the figure with reduced height
+    fig, ax = plt.subplots(figsize=(12, 6))
     
-    # Use a better colormap - Blues from light to dark
-    import matplotlib.cm as cm
-    # Use 'Blues' but modify it to start from light blue instead of white
-    colormap = cm.get_cmap('Blues')
-    # Create a new colormap that starts from light blue (0.2) instead of white (0.0)
-    from matplotlib.colors import ListedColormap
-    colors = colormap(np.linspace(0.2, 1.0, 256))  # Start from 0.2 instead of 0.0
-    colormap = ListedColormap(colors)
+    # Prepare data for each property, unless counts from compute_property_data
+    # were passed in; computed once and reused by the summary
+    if property_data is None:
+        property_data = compute_property_data(df, properties)
     
     # Create stacked horizontal bars
     y_pos = np.arange(len(properties))
     bar_width = 0.8
     
+    # Create color mapping based on frequency (heatmap style), for all segments
+    # at once and in drawing order
+    all_counts = np.fromiter((count for prop in properties for count in property_data[prop].values()), 
+                             dtype=np.int64)
+    segment_colors = _BLUES(normalize_counts(all_counts))
+    text_colors = contrast_text_colors(segment_colors)
+    
     # Draw each segment
+    first_segment = 0
     for i, prop in enumerate(properties):
         values = property_data[prop]
+        labels = list(values.keys())
+        counts = np.fromiter(values.values(), dtype=np.int64, count=len(values))
+        lefts = np.cumsum(counts) - counts
+        last_segment = first_segment + len(counts)
         
-        left = 0
+        # Draw all segments of the bar as a single collection, rasterized so vector
+        # outputs embed one image per bar while labels stay as text
+        ax.broken_barh(list(zip(lefts, counts)), (i - bar_width / 2, bar_width), 
+                       facecolors=segment_colors[first_segment:last_segment], alpha=0.8, 
+                       edgecolor='white', linewidth=1.5, rasterized=True)
         
-        for j, (value, count) in enumerate(values.items()):
-            # Calculate color based on frequency
-            #if value == 'Undefined':
-            #    # Very light grey for undefined, with white border for consistency
-            #    color = '#f0f0f0'  # Very light grey
-            #    edgecolor = 'white'  # Changed from 'none' to 'white'
-            #    linewidth = 1.5  # Changed from 0 to 1.5 (same as other segments)
-            #else:
-            # Normalize count to [0,1] for colormap
-            normalized_count = (count - min_count) / (max_count - min_count) if max_count > min_count else 0.5
-            color = colormap(normalized_count)
-            edgecolor = 'white'
-            linewidth = 1.5
+        # Add label only if frequency is 3 or higher
+        for j in np.flatnonzero(counts >= 3):
+            value, count = labels[j], counts[j]
             
-            # Draw the segment
-            ax.barh(i, count, left=left, height=bar_width, 
-                   color=color, alpha=0.8, edgecolor=edgecolor, linewidth=linewidth)
-            
-            # Add label only if frequency is 3 or higher
-            if count >= 3:
-                # Determine text color based on background brightness
-                if value == 'Undefined':
-                    text_color = 'black'  # Always black for light grey undefined
-                else:
-                    # Calculate brightness of the background color
-                    if hasattr(color, '__len__') and len(color) == 4:  # RGBA
-                        r, g, b, a = color
-                    elif hasattr(color, '__len__') and len(color) == 3:  # RGB
-                        r, g, b = color
-                    else:
-                        # For matplotlib color objects, convert to RGB
-                        import matplotlib.colors as mcolors
-                        rgb = mcolors.to_rgb(color)
-                        r, g, b = rgb
-                    
-                    # Calculate relative luminance (brightness)
-                    brightness = 0.299 * r + 0.587 * g + 0.114 * b
-                    
-                    # Use black text for light backgrounds, white for dark backgrounds
-                    text_color = 'black' if brightness > 0.5 else 'white'
-                
-                if count <= 10:
-                    rotation = 15
-                else:
-                    rotation = 0
-
-                # Add label with number below (always centered)
-                ax.text(left + count/2, i, f'{value}\n({count})', 
-                       ha='center', va='center', fontweight='normal', 
-                       fontsize=14, color=text_color, rotation=rotation)
+            # Determine text color based on background brightness
+            if value == 'Undefined':
+                text_color = 'black'  # Always black for light grey undefined
+            else:
+                text_color = text_colors[first_segment + j]
             
-            left += count
+            if count <= 10:
+                rotation = 15
+            else:
+                rotation = 0
+
+            # Add label with number below (always centered)
+            ax.text(lefts[j] + count/2, i, f'{value}\n({count})', 
+                   ha='center', va='center', fontweight='normal', 
+                   fontsize=14, color=text_color, rotation=rotation)
+        
+        first_segment = last_segment
     
     # Customize the plot - consistent font sizes
     ax.set_yticks(y_pos)
@@ -307,7 +408,7 @@ def create_stacked_distribution_plot(df, properties, output_file='dataset_distri
     ax.set_xlim(0, max_total)
     
     # Remove the colorbar completely
-    # sm = plt.cm.ScalarMappable(cmap=colormap, norm=plt.Normalize(vmin=min_count, vmax=max_count))
+    # sm = plt.cm.ScalarMappable(cmap=_BLUES, norm=Normalize(vmin=all_counts.min(), vmax=all_counts.max()))
     # sm.set_array([])
     # cbar = plt.colorbar(sm, ax=ax, shrink=0.8)
     # cbar.set_label('Number of Datasets', fontsize=12)  # Keep at 12
@@ -317,7 +418,7 @@ def create_stacked_distribution_plot(df, properties, output_file='dataset_distri
     plt.tight_layout()
     
     # Save the plot
-    plt.savefig('figures/' + output_file, dpi=300, bbox_inches='tight', 
+    plt.savefig('figures/' + output_file, dpi=dpi, bbox_inches='tight', 
                 facecolor='white', edgecolor='none')
     
     print(f"Stacked distribution plot saved as {output_file}")
@@ -327,23 +428,12 @@ def create_stacked_distribution_plot(df, properties, output_file='dataset_distri
     print("DATASET DISTRIBUTION SUMMARY")
     print("="*60)
     
+    # Reuse the counts computed for the plot, already sorted by frequency
+    total = len(df)
     for prop in properties:
-        values = df[prop].fillna('Undefined').astype(str)
-        if prop == 'License':
-            values = values.apply(map_license_to_spdx)
-        elif prop == 'Languages':
-            values = values.apply(map_language_codes)
-        elif prop == 'Size':
-            values = values.apply(map_size_categories)
-        values = values.replace(['', '-', 'nan'], 'Undefined')
-        values = values.apply(capitalize_label)
-        
-        value_counts = aggregate_low_frequency_values(values, threshold=1)
-        total = len(df)
-        
         print(f"\n{prop}:")
         print("-" * 30)
-        for value, count in sorted(value_counts.items(), key=lambda x: x[1], reverse=True):
+        for value, count in property_data[prop].items():
             percentage = (count / total) * 100
             print(f"  {value}: {count} ({percentage:.1f}%)")
 
@@ -354,22 +444,19 @@ def create_bubble_plot(df, output_file='re_stage_task_bubble.png'):
     fig, ax = plt.subplots(figsize=(6, 3.5))
     
     # Prepare data for RE stage and Task
-    re_stage_values = df['RE stage'].fillna('Undefined').astype(str)
-    task_values = df['Task'].fillna('Undefined').astype(str)
-    
-    # Replace empty strings and dashes with 'Undefined'
-    re_stage_values = re_stage_values.replace(['', '-', 'nan'], 'Undefined')
-    task_values = task_values.replace(['', '-', 'nan'], 'Undefined')
+    # Replace missing values, empty strings and dashes with 'Undefined'
+    re_stage_values = fill_undefined(df['RE stage'])
+    task_values = fill_undefined(df['Task'])
     
     # Capitalize labels
-    re_stage_values = re_stage_values.apply(capitalize_label)
-    task_values = task_values.apply(capitalize_label)
+    re_stage_values = capitalize_series(re_stage_values)
+    task_values = capitalize_series(task_values)
     
     # Parse "verification & validation" to "v&v" for better visibility
     re_stage_values = re_stage_values.replace('Verification & validation', 'V&V')
     
     # Create cross-tabulation
-    cross_tab = pd.crosstab(re_stage_values, task_values)
+    cross_tab = re_stage_values.groupby([re_stage_values, task_values]).size().unstack(fill_value=0)
     
     # Define custom order for both axes
     # Y-axis order (top to bottom): elicitation, analysis, specification, management, v&v
@@ -384,74 +471,32 @@ def create_bubble_plot(df, output_file='re_stage_task_bubble.png'):
     # Reorder the cross-tabulation
     cross_tab = cross_tab.reindex(index=re_stages, columns=tasks, fill_value=0)
     
-    # Create bubble plot data
-    bubble_data = []
-    for i, re_stage in enumerate(re_stages):
-        for j, task in enumerate(tasks):
-            count = cross_tab.loc[re_stage, task]
-            if count > 0:  # Only plot bubbles for non-zero counts
-                bubble_data.append({
-                    'x': j,
-                    'y': i,
-                    'size': count,
-                    're_stage': re_stage,
-                    'task': task,
-                    'count': count
-                })
-    
-    # Convert to DataFrame for easier handling
-    bubble_df = pd.DataFrame(bubble_data)
-    
-    if len(bubble_df) == 0:
+    # Create bubble plot data, only for non-zero counts
+    y, x = np.nonzero(cross_tab.to_numpy())
+    counts = cross_tab.to_numpy()[y, x]
+    
+    if len(counts) == 0:
         print("No data to plot for RE stage vs Task bubble plot")
         return
     
-    # Use the same color scheme as the bar plot
-    import matplotlib.cm as cm
-    from matplotlib.colors import ListedColormap
-    
-    # Get all counts for color mapping
-    all_counts = bubble_df['count'].values
-    min_count = min(all_counts)
-    max_count = max(all_counts)
-    
+    # Calculate colors and bubble sizes based on frequency (same logic as bar plot)
+    # Larger bubbles, less padding
+    min_size = 200
+    max_size = 2000
+    normalized_counts = normalize_counts(counts)
     # Use the same Blues colormap as the bar plot
-    colormap = cm.get_cmap('Blues')
-    colors = colormap(np.linspace(0.2, 1.0, 256))  # Start from 0.2 instead of 0.0
-    colormap = ListedColormap(colors)
-    
-    # Create the bubble plot
-    for _, row in bubble_df.iterrows():
-        # Calculate color based on frequency (same logic as bar plot)
-        normalized_count = (row['count'] - min_count) / (max_count - min_count) if max_count > min_count else 0.5
-        color = colormap(normalized_count)
-        
-        # Calculate bubble size (larger bubbles, less padding)
-        min_size = 200
-        max_size = 2000
-        size = min_size + (row['count'] - min_count) / (max_count - min_count) * (max_size - min_size) if max_count > min_count else (min_size + max_size) / 2
-        
-        # Draw the bubble
-        ax.scatter(row['x'], row['y'], s=size, c=[color], alpha=0.8, 
-                  edgecolors='white', linewidth=1.5)
-        
-        # Add count label for ALL bubbles (including those with 1 instance)
-        # Determine text color based on background brightness (same logic as bar plot)
-        if hasattr(color, '__len__') and len(color) == 4:  # RGBA
-            r, g, b, a = color
-        elif hasattr(color, '__len__') and len(color) == 3:  # RGB
-            r, g, b = color
-        else:
-            import matplotlib.colors as mcolors
-            rgb = mcolors.to_rgb(color)
-            r, g, b = rgb
-        
-        # Calculate relative luminance (brightness)
-        brightness = 0.299 * r + 0.587 * g + 0.114 * b
-        text_color = 'black' if brightness > 0.5 else 'white'
-        
-        # Add count label for all bubbles
-        ax.text(row['x'], row['y'], str(row['count']), 
+    bubble_colors = _BLUES(normalized_counts)
+    sizes = min_size + normalized_counts * (max_size - min_size)
+    
+    # Draw all bubbles at once, rasterized like the bars of the stacked plot
+    ax.scatter(x, y, s=sizes, c=bubble_colors, alpha=0.8, 
+              edgecolors='white', linewidth=1.5, rasterized=True)
+    
+    # Add count label for ALL bubbles (including those with 1 instance)
+    # Determine text color based on background brightness (same logic as bar plot)
+    text_colors = contrast_text_colors(bubble_colors)
+    for bubble_x, bubble_y, count, text_color in zip(x, y, counts, text_colors):
+        ax.text(bubble_x, bubble_y, str(count), 
                ha='center', va='center', fontweight='normal', 
                fontsize=14, color=text_color)
     
@@ -507,10 +552,8 @@ def create_year_line_plot(df, output_file='year_dataset_line.png'):
     fig, ax = plt.subplots(figsize=(6, 3.5))
     
     # Prepare year data
-    year_values = df['Year'].fillna('Undefined').astype(str)
-    
-    # Replace empty strings and dashes with 'Undefined'
-    year_values = year_values.replace(['', '-', 'nan'], 'Undefined')
+    # Replace missing values, empty strings and dashes with 'Undefined'
+    year_values = fill_undefined(df['Year'])
     
     # Filter out 'Undefined' values and convert to numeric
     valid_years = year_values[year_values != 'Undefined']
@@ -552,10 +595,11 @@ def create_year_line_plot(df, output_file='year_dataset_line.png'):
     
     # Add count labels on each point with better positioning to avoid overlap
     # Only show labels for non-zero counts to avoid clutter
-    for year, count in zip(years, counts):
-        if count > 0:  # Only show labels for years with datasets
-            ax.text(year, count + max(counts) * 0.05, str(count), ha='center', va='bottom', 
-                   fontweight='normal', fontsize=16, color=line_color)
+    label_offset = counts.max() * 0.05
+    has_datasets = counts > 0  # Only show labels for years with datasets
+    for year, count in zip(years[has_datasets], counts[has_datasets]):
+        ax.text(year, count + label_offset, str(count), ha='center', va='bottom', 
+               fontweight='normal', fontsize=16, color=line_color)
     
     # Set up axes with same styling as bubble plot
     ax.set_xlabel('Year', fontsize=14, fontweight='normal')
@@ -607,8 +651,12 @@ def main():
     print(f"Loaded {len(df)} datasets")
     print(f"Properties to analyze: {PROPERTIES}")
     
+    # Count the property values once, the stacked plot and its summary share them
+    property_data = compute_property_data(df, PROPERTIES)
+    
     # Create the stacked plot
-    create_stacked_distribution_plot(df, PROPERTIES, 'dataset_distribution_stacked.png')
+    create_stacked_distribution_plot(df, PROPERTIES, 'dataset_distribution_stacked.png', 
+                                     property_data=property_data)
     
     # Create the bubble plot
     create_bubble_plot(df, 're_stage_task_bubble.png')